@@ -1,5 +1,9 @@
-from .controllers import BaseAutomlController, SearchDimension, GridSearchController, SingleVarSearchController, StageWiseSearchController, AlterDecorator, SinglePeakPruner
-from .common import DictBasedConfig, FlexibleBaseConfig, ConfigVarAccessor, DictConfigVarAccessor, CostEstimator, TrainLog
+from .controllers import BaseAutomlController, SearchDimension, GridSearchController, SingleVarSearchController, RefinementSearchController, StageWiseSearchController, \
+    AlterDecorator, SinglePeakPruner, ExpectedImprovementPerSecondRanker, CheckpointReuseScheduler, ScheduledTrial, TrialLineage
+from .common import DictBasedConfig, FlexibleBaseConfig, ConfigVarAccessor, DictConfigVarAccessor, MultiVarAccessor, CostEstimator, TrainLog, config_fingerprint, TrialResultCache
+from .simulation import ReplayTable, ReplayCostEstimator, ReplaySimulator, SimulationResult
 
-__all__ = ['BaseAutomlController', 'SearchDimension', 'GridSearchController', 'SingleVarSearchController', 'StageWiseSearchController', 'SinglePeakPruner',
-           'AlterDecorator', 'DictBasedConfig', 'FlexibleBaseConfig', 'ConfigVarAccessor', 'DictConfigVarAccessor', 'CostEstimator', 'TrainLog']
+__all__ = ['BaseAutomlController', 'SearchDimension', 'GridSearchController', 'SingleVarSearchController', 'RefinementSearchController', 'StageWiseSearchController', 'SinglePeakPruner',
+           'ExpectedImprovementPerSecondRanker', 'AlterDecorator', 'DictBasedConfig', 'FlexibleBaseConfig', 'ConfigVarAccessor', 'DictConfigVarAccessor', 'MultiVarAccessor',
+           'CostEstimator', 'TrainLog', 'config_fingerprint', 'TrialResultCache', 'CheckpointReuseScheduler', 'ScheduledTrial', 'TrialLineage', 'ReplayTable', 'ReplayCostEstimator',
+           'ReplaySimulator', 'SimulationResult']
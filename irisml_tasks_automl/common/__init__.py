@@ -1,5 +1,7 @@
-from .base_config import DictBasedConfig, FlexibleBaseConfig, ConfigVarAccessor, DictConfigVarAccessor
+from .base_config import DictBasedConfig, FlexibleBaseConfig, ConfigVarAccessor, DictConfigVarAccessor, MultiVarAccessor
 from .cost_estimator import CostEstimator
+from .fingerprint import config_fingerprint
+from .result_cache import TrialResultCache
 from .train_log import TrainLog
 
-__all__ = ['DictBasedConfig', 'FlexibleBaseConfig', 'ConfigVarAccessor', 'DictConfigVarAccessor', 'CostEstimator', 'TrainLog']
+__all__ = ['DictBasedConfig', 'FlexibleBaseConfig', 'ConfigVarAccessor', 'DictConfigVarAccessor', 'MultiVarAccessor', 'CostEstimator', 'TrainLog', 'config_fingerprint', 'TrialResultCache']
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from copy import deepcopy
+from typing import List
 
 
 class FlexibleBaseConfig(ABC):
@@ -44,6 +45,9 @@ class ConfigVarAccessor(ABC):
     accessor for certain dimension/variables in config
     """
 
+    # whether assign_val_to_config_in_place modifies config itself instead of returning a copy
+    supports_in_place = False
+
     @abstractmethod
     def assign_val_to_config(self, config, val):
         pass
@@ -52,22 +56,81 @@ class ConfigVarAccessor(ABC):
     def parse_value(self, config):
         pass
 
+    def assign_val_to_config_in_place(self, config, val):
+        """assign val to config, modifying config itself when the accessor supports it, and return the resulting config
+        By default, this falls back to assign_val_to_config, which returns a copy
+        """
+        return self.assign_val_to_config(config, val)
+
+    def equals_except_var(self, config, other):
+        """check if config equals other when this variable is disregarded, i.e. assigning the value of other to config would make them equal
+        By default, this is done with a copy, subclasses could override it to compare without copying
+        """
+        return self.assign_val_to_config(config, self.parse_value(other)) == other
+
+
+class MultiVarAccessor(ConfigVarAccessor):
+    """
+    accessor for multiple dimensions/variables in config, which are assigned in order with a single copy of config
+    (or one copy per accessor not supporting in-place assignment, as it copies anyway)
+    """
+
+    def __init__(self, var_accessors: List[ConfigVarAccessor]):
+        self.var_accessors = var_accessors
+        self.supports_in_place = all(x.supports_in_place for x in var_accessors)
+
+    def assign_val_to_config(self, config, vals):
+        return self._assign_vals(config, vals, copied=False)
+
+    def assign_val_to_config_in_place(self, config, vals):
+        return self._assign_vals(config, vals, copied=True)
+
+    def _assign_vals(self, config, vals, copied):
+        if len(vals) != len(self.var_accessors):
+            raise ValueError(f'{len(vals)} values provided for {len(self.var_accessors)} accessors.')
+
+        for var_accessor, val in zip(self.var_accessors, vals):
+            if not var_accessor.supports_in_place:
+                config = var_accessor.assign_val_to_config(config, val)
+            else:
+                if not copied:
+                    config = deepcopy(config)
+                config = var_accessor.assign_val_to_config_in_place(config, val)
+            copied = True
+        return config
+
+    def parse_value(self, config):
+        return [x.parse_value(config) for x in self.var_accessors]
+
+    def equals_except_var(self, config, other):
+        """compared without copying if all the accessors are DictConfigVarAccessor, otherwise by assigning the values of other to a copy of config"""
+        if all(isinstance(x, DictConfigVarAccessor) for x in self.var_accessors):
+            return DictConfigVarAccessor.equals_except_vars(config, other, self.var_accessors)
+
+        return super().equals_except_var(config, other)
+
 
 class DictConfigVarAccessor(ConfigVarAccessor):
     """
     accessor for certain dimension/variables in dictionary (i.e. dict()) (not working for FlexibleBaseConfig)
     """
 
+    supports_in_place = True
+
     def __init__(self, path):
         self._paths = path.split(DictBasedConfig.SEPARATOR)
 
     def assign_val_to_config(self, config: dict, val):
         DictConfigVarAccessor._throw_if_not_dict(config)
 
-        result = deepcopy(config)
+        return self.assign_val_to_config_in_place(deepcopy(config), val)
+
+    def assign_val_to_config_in_place(self, config: dict, val):
+        DictConfigVarAccessor._throw_if_not_dict(config)
+
         last_level = self._paths[-1]
-        self._access_second_to_the_last_level(result)[last_level] = val
-        return result
+        self._access_second_to_the_last_level(config)[last_level] = val
+        return config
 
     def parse_value(self, config: dict):
         DictConfigVarAccessor._throw_if_not_dict(config)
@@ -75,6 +138,44 @@ class DictConfigVarAccessor(ConfigVarAccessor):
         last_level = self._paths[-1]
         return self._access_second_to_the_last_level(config)[last_level]
 
+    def equals_except_var(self, config: dict, other: dict):
+        return DictConfigVarAccessor.equals_except_vars(config, other, [self])
+
+    @staticmethod
+    def equals_except_vars(config: dict, other: dict, var_accessors: List['DictConfigVarAccessor']):
+        """check if config equals other when the variables of all the var_accessors are disregarded, without copying"""
+        DictConfigVarAccessor._throw_if_not_dict(config)
+        DictConfigVarAccessor._throw_if_not_dict(other)
+
+        return DictConfigVarAccessor._equals_except_paths(config, other, [x._paths for x in var_accessors])
+
+    @staticmethod
+    def _equals_except_paths(config, other, paths):
+        if not isinstance(config, dict) or not isinstance(other, dict):
+            return False
+
+        last_levels = {x[0] for x in paths if len(x) == 1}
+        sub_paths = {}
+        for x in paths:
+            if len(x) > 1 and x[0] not in last_levels:
+                sub_paths.setdefault(x[0], []).append(x[1:])
+
+        # the last levels are allowed to be missing in config, as assigning would add them
+        if set(config.keys()) | last_levels != set(other.keys()):
+            return False
+
+        for key in config:
+            if key in last_levels:
+                continue
+
+            if key in sub_paths:
+                if not DictConfigVarAccessor._equals_except_paths(config[key], other[key], sub_paths[key]):
+                    return False
+            elif config[key] != other[key]:
+                return False
+
+        return True
+
     def _access_second_to_the_last_level(self, config: dict):
         temp = config
         for i, path in enumerate(self._paths):
@@ -11,3 +11,7 @@ class CostEstimator(ABC):
     @abstractmethod
     def estimate(self, train_config, dataset):
         pass
+
+    def estimate_incremental(self, train_config, dataset, parent_config):
+        """estimate the cost of training train_config when resuming from the checkpoint of parent_config, e.g. only the additional epochs"""
+        return max(0, self.estimate(train_config, dataset) - self.estimate(parent_config, dataset))
@@ -0,0 +1,37 @@
+import hashlib
+import json
+
+
+def config_fingerprint(config):
+    """
+    Canonical hash of a config, which is the same for equal configs regardless of key order, e.g. for dict-based configs and FlexibleBaseConfig.
+    Numbers comparing equal are hashed the same, i.e. bools and integral floats are hashed as ints
+    """
+
+    canonical = json.dumps(_canonicalize(config), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _canonicalize(obj):
+    if isinstance(obj, bool):
+        return int(obj)
+
+    if isinstance(obj, float) and obj.is_integer():
+        return int(obj)
+
+    if obj is None or isinstance(obj, (str, int, float)):
+        return obj
+
+    if isinstance(obj, dict):
+        return {repr(_canonicalize(key)): _canonicalize(val) for key, val in obj.items()}
+
+    if isinstance(obj, (list, tuple)):
+        return [_canonicalize(x) for x in obj]
+
+    if isinstance(obj, (set, frozenset)):
+        return sorted(repr(_canonicalize(x)) for x in obj)
+
+    if hasattr(obj, '__dict__'):
+        return {'__class__': type(obj).__qualname__, '__dict__': _canonicalize(vars(obj))}
+
+    return repr(obj)
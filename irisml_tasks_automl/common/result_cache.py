@@ -0,0 +1,110 @@
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+
+from .fingerprint import config_fingerprint
+from .train_log import TrainLog
+
+
+class TrialResultCache(object):
+    """
+    Local on-disk cache of train logs, keyed by the fingerprint of the config, the identity of the dataset and the version, so that identical trials across searches are trained once.
+
+    Entries recorded under a different version (e.g. of the training code or data) are never hit, and are eventually removed by eviction: when there are more than max_entries
+    entries, the least recently used ones are evicted. Entries failing to load are treated as missing and removed, and train logs failing to store are not cached.
+    Train logs with err_msg are not cached, as failures might be transient.
+
+    Args:
+        cache_dir: directory to store the entries
+        dataset_id: identity of the dataset, e.g. name and version
+        version: version of the training code or data, changing it invalidates the existing entries
+        max_entries: maximum number of entries, None for unlimited
+    """
+
+    SUFFIX = '.pkl'
+
+    def __init__(self, cache_dir, dataset_id: str, version: str = '', max_entries=1000):
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.dataset_id = dataset_id
+        self.version = version
+        self.max_entries = max_entries
+
+    def get(self, config):
+        path = self._get_path(config)
+        try:
+            with open(path, 'rb') as f:
+                train_log = pickle.load(f)['train_log']
+            # mark as recently used for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # e.g. truncated entries, or config classes renamed since the entry was written
+            self._remove(path)
+            return None
+
+        return train_log
+
+    def put(self, train_log: TrainLog):
+        if train_log.err_msg:
+            return
+
+        path = self._get_path(train_log.config)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'version': self.version, 'train_log': train_log}, f)
+            os.replace(temp_path, path)
+        except Exception:
+            # e.g. unpicklable configs, which are simply not cached
+            self._remove(temp_path)
+            return
+
+        self._evict()
+
+    def wrap(self, train_func):
+        """wrap train_func (config -> TrainLog), so that it consults the cache before training, and populates it after training"""
+        def cached_train_func(config):
+            train_log = self.get(config)
+            if train_log is None:
+                train_log = train_func(config)
+                self.put(train_log)
+            return train_log
+
+        return cached_train_func
+
+    def clear(self):
+        for path in self._list_entries():
+            self._remove(path)
+
+    def __len__(self):
+        return len(self._list_entries())
+
+    def _get_path(self, config):
+        key = hashlib.sha256(f'{self.dataset_id}\n{self.version}\n{config_fingerprint(config)}'.encode('utf-8')).hexdigest()
+        return self.cache_dir / (key + TrialResultCache.SUFFIX)
+
+    def _list_entries(self):
+        return list(self.cache_dir.glob('*' + TrialResultCache.SUFFIX))
+
+    def _evict(self):
+        if self.max_entries is None:
+            return
+
+        paths = self._list_entries()
+        if len(paths) <= self.max_entries:
+            return
+
+        paths.sort(key=lambda x: x.stat().st_mtime)
+        for path in paths[:len(paths) - self.max_entries]:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,5 +1,9 @@
-from .search_controller import BaseAutomlController, SearchDimension, GridSearchController, SingleVarSearchController, StageWiseSearchController, AlterDecorator
+from .search_controller import BaseAutomlController, SearchDimension, GridSearchController, SingleVarSearchController, RefinementSearchController, StageWiseSearchController, \
+    AlterDecorator
 from .search_pruners import SinglePeakPruner
+from .candidate_rankers import ExpectedImprovementPerSecondRanker
+from .checkpoint_scheduler import CheckpointReuseScheduler, ScheduledTrial, TrialLineage
 
 
-__all__ = ['BaseAutomlController', 'SearchDimension', 'GridSearchController', 'SingleVarSearchController', 'StageWiseSearchController', 'SinglePeakPruner', 'AlterDecorator']
+__all__ = ['BaseAutomlController', 'SearchDimension', 'GridSearchController', 'SingleVarSearchController', 'RefinementSearchController', 'StageWiseSearchController', 'SinglePeakPruner',
+           'ExpectedImprovementPerSecondRanker', 'AlterDecorator', 'CheckpointReuseScheduler', 'ScheduledTrial', 'TrialLineage']
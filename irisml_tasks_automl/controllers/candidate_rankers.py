@@ -0,0 +1,85 @@
+import math
+from abc import ABC, abstractmethod
+from typing import List
+
+from ..common.train_log import TrainLog
+
+
+class CandidateRanker(ABC):
+    """
+    Ranker in config searching process. This class defines the logic ordering the candidate configs to try based on history and their estimated costs
+    """
+
+    @abstractmethod
+    def rank(self, candidate_configs: List, costs: List, featurize, history: List[TrainLog]):
+        """
+        Args:
+            candidate_configs: candidate configs to rank
+            costs: estimated costs of candidate_configs
+            featurize: function mapping a config to a list of numbers in [0, 1], or None if the config is out of the search space
+            history: training history
+
+        Returns:
+            candidate_configs in the order to try
+        """
+        pass
+
+
+class ExpectedImprovementPerSecondRanker(CandidateRanker):
+    """
+    This class ranks candidates by the expected improvement over the best metric value in history per second of estimated cost.
+
+    The metric of a candidate is predicted with Gaussian kernel regression over history, shrunk towards the mean of history as a prior observation,
+    and its uncertainty decreases with the total kernel weight of history around the candidate.
+    Without history, candidates are ranked from the cheapest.
+
+    expected improvement: https://en.wikipedia.org/wiki/Bayesian_optimization
+
+    Args:
+        bandwidth: bandwidth of the Gaussian kernel in feature space
+        xi: minimal improvement worth trying, trading exploration for exploitation
+        min_cost: lower bound of costs, avoiding division by zero
+    """
+
+    def __init__(self, bandwidth=0.25, xi=0.0, min_cost=1e-3):
+        self.bandwidth = bandwidth
+        self.xi = xi
+        self.min_cost = min_cost
+
+    def rank(self, candidate_configs, costs, featurize, history):
+        observations = [(featurize(x.config), x.automl_metric_val) for x in history if not x.err_msg] if history else []
+        observations = [x for x in observations if x[0] is not None]
+        if not observations:
+            order = sorted(range(len(candidate_configs)), key=lambda i: costs[i])
+            return [candidate_configs[i] for i in order]
+
+        metric_vals = [x[1] for x in observations]
+        prior_mean = sum(metric_vals) / len(metric_vals)
+        prior_std = math.sqrt(sum((x - prior_mean) ** 2 for x in metric_vals) / len(metric_vals)) or abs(prior_mean) or 1.0
+        best_val = max(metric_vals)
+
+        scores = []
+        for config, cost in zip(candidate_configs, costs):
+            features = featurize(config)
+            if features is None:
+                scores.append(0)
+                continue
+
+            mean, std = self._predict(features, observations, prior_mean, prior_std)
+            scores.append(self._expected_improvement(mean, std, best_val) / max(cost, self.min_cost))
+
+        order = sorted(range(len(candidate_configs)), key=lambda i: scores[i], reverse=True)
+        return [candidate_configs[i] for i in order]
+
+    def _predict(self, features, observations, prior_mean, prior_std):
+        weights = [math.exp(-sum((a - b) ** 2 for a, b in zip(features, x)) / (2 * self.bandwidth ** 2)) for x, _ in observations]
+        total_weight = 1 + sum(weights)
+        mean = (prior_mean + sum(w * y for w, (_, y) in zip(weights, observations))) / total_weight
+        return mean, prior_std / math.sqrt(total_weight)
+
+    def _expected_improvement(self, mean, std, best_val):
+        improvement = mean - best_val - self.xi
+        z = improvement / std
+        cdf = 0.5 * (1 + math.erf(z / math.sqrt(2)))
+        pdf = math.exp(-z ** 2 / 2) / math.sqrt(2 * math.pi)
+        return improvement * cdf + std * pdf
@@ -0,0 +1,103 @@
+from typing import List
+
+from .search_controller import BaseAutomlController
+from ..common.base_config import ConfigVarAccessor
+from ..common.fingerprint import config_fingerprint
+from ..common.train_log import TrainLog
+
+
+class TrialLineage(object):
+    """
+    Lineage of a trial resuming from a shorter sibling, which is the fingerprint of the parent config and the increase of the fidelity dimension (e.g. number of epochs) over it
+    """
+
+    def __init__(self, parent_fingerprint: str, fidelity_delta):
+        self.parent_fingerprint = parent_fingerprint
+        self.fidelity_delta = fidelity_delta
+
+
+class ScheduledTrial(object):
+    """
+    A config scheduled to train, with the config to actually train (given by the resume hook), its incremental cost, and its lineage (None if trained from scratch).
+    depends_on is the ScheduledTrial of the parent if it is in the same round, which must finish before this trial starts, None if the parent is in history
+    """
+
+    def __init__(self, config, cost, parent_config=None, lineage: TrialLineage = None, train_config=None, depends_on=None):
+        self.config = config
+        self.cost = cost
+        self.parent_config = parent_config
+        self.lineage = lineage
+        self.train_config = train_config if train_config is not None else config
+        self.depends_on = depends_on
+
+
+class CheckpointReuseScheduler(BaseAutomlController):
+    """
+    A decorator that orders the configs generated by the controller, so that a config can resume from the checkpoint of a sibling differing only in the fidelity dimension
+    (e.g. the same config with fewer epochs), which is either in history or scheduled earlier. Trials resuming from a sibling are only charged the incremental cost given by
+    CostEstimator.estimate_incremental, which lets more configs fit in budget_in_secs.
+
+    Resuming is only available through generate_scheduled_trials, where each trial carries its train_config and the trial it depends on in the same round.
+    generate_training_configs returns plain configs, which are trained from scratch, so they are charged the full cost.
+
+    Args:
+        fidelity_accessor: accessor to the fidelity dimension, whose values are ordered, e.g. epochs
+        resume_hook: optional function (config, parent_config, lineage) -> config to train, e.g. pointing the config to the checkpoint of parent_config
+    """
+
+    def __init__(self, controller: BaseAutomlController, dataset, fidelity_accessor: ConfigVarAccessor, resume_hook=None):
+        self.controller = controller
+        self.dataset = dataset
+        self.fidelity_accessor = fidelity_accessor
+        self.resume_hook = resume_hook
+        super().__init__(self.controller.cost_estimator, self.controller.base_config)
+
+    def generate_training_configs(self, budget_in_secs: int, history: List[TrainLog], n_trials: int):
+        return [x.config for x in self._schedule_trials(budget_in_secs, history, n_trials, resume=False)]
+
+    def generate_scheduled_trials(self, budget_in_secs: int, history: List[TrainLog], n_trials: int):
+        return self._schedule_trials(budget_in_secs, history, n_trials, resume=True)
+
+    def _schedule_trials(self, budget_in_secs, history, n_trials, resume):
+        # budget and n_trials are applied after scheduling, as the controller is not aware of the cost saved by resuming
+        configs = self.controller.generate_training_configs(float('inf'), history, float('inf'))
+        configs = sorted(configs, key=self.fidelity_accessor.parse_value)
+        checkpoint_configs = [x.config for x in history if not x.err_msg] if history else []
+
+        used_budget = 0
+        result = []
+        for config in configs:
+            if len(result) >= n_trials:
+                break
+
+            parent_config = self.find_parent_config(config, checkpoint_configs + [x.config for x in result]) if resume else None
+            if parent_config is None:
+                trial = ScheduledTrial(config, self.cost_estimator.estimate(config, self.dataset))
+            else:
+                lineage = TrialLineage(config_fingerprint(parent_config), self.fidelity_accessor.parse_value(config) - self.fidelity_accessor.parse_value(parent_config))
+                train_config = self.resume_hook(config, parent_config, lineage) if self.resume_hook else config
+                depends_on = next((x for x in result if x.config is parent_config), None)
+                trial = ScheduledTrial(config, self.cost_estimator.estimate_incremental(config, self.dataset, parent_config), parent_config, lineage, train_config, depends_on)
+
+            if trial.cost > budget_in_secs - used_budget:
+                continue
+
+            used_budget += trial.cost
+            result.append(trial)
+
+        return result
+
+    def find_parent_config(self, config, configs):
+        """find the sibling of config with the highest fidelity lower than that of config, None if there is no such sibling"""
+        fidelity = self.fidelity_accessor.parse_value(config)
+        siblings = [x for x in configs if self.fidelity_accessor.parse_value(x) < fidelity and self.fidelity_accessor.equals_except_var(x, config)]
+        if not siblings:
+            return None
+
+        return max(siblings, key=self.fidelity_accessor.parse_value)
+
+    def find_best_config(self, history: List[TrainLog]):
+        return self.controller.find_best_config(history)
+
+    def set_base_config(self, config):
+        self.controller.set_base_config(config)
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import List
+from .candidate_rankers import CandidateRanker
 from .search_pruners import CandidatePruner
-from ..common.base_config import ConfigVarAccessor
+from ..common.base_config import ConfigVarAccessor, MultiVarAccessor
 from ..common.train_log import TrainLog
+import math
 import random
 
 from copy import deepcopy
@@ -52,30 +54,43 @@ class SearchDimension(object):
 
         self.candidates_order = candidates_order or candidates
 
+    def featurize(self, config):
+        """position of the value of config in candidates_order, scaled to [0, 1], None if the value is not a candidate"""
+        val = self.var_accessor.parse_value(config)
+        if val not in self.candidates_order:
+            return None
+
+        return self.candidates_order.index(val) / max(len(self.candidates_order) - 1, 1)
+
 
 class SingleVarSearchController(BaseAutomlController):
     """
     A controller that searches one dimension/variable in config, to find the best config in a heuristic manner
+
+    Candidates are tried in the order of candidates (shuffled if random_seed is given), or in the order given by candidate_ranker if provided
     """
 
-    def __init__(self, base_config, cost_estimator, dataset, candidates, var_accessor, pruner=None, random_seed=None, candidates_order=None):
+    def __init__(self, base_config, cost_estimator, dataset, candidates, var_accessor, pruner=None, random_seed=None, candidates_order=None, candidate_ranker: CandidateRanker = None):
         super(SingleVarSearchController, self).__init__(cost_estimator, base_config)
         self.dataset = dataset
         self.search_dim = SearchDimension(candidates, var_accessor, pruner, candidates_order)
         self.random_seed = random_seed
+        self.candidate_ranker = candidate_ranker
 
     def generate_training_configs(self, budget_in_secs, history, n_trials):
         used_budget = 0
         result = []
-        candidates_in_order = [x for x in self.search_dim.pruner.prune(self.base_config, self.search_dim.candidates_order, history)] if self.search_dim.pruner else self.search_dim.candidates
-        candidates = [x for x in self.search_dim.candidates if x in candidates_in_order]
-        candidate_configs = [self.search_dim.var_accessor.assign_val_to_config(self.base_config, x) for x in candidates]
+        candidate_configs = [self.search_dim.var_accessor.assign_val_to_config(self.base_config, x) for x in self.worth_trying_candidates(history)]
         partial_history = self.keep_history_varied_from_base_config(history)
         partial_history_configs = [x.config for x in partial_history]
 
         if self.random_seed:
             random.Random(self.random_seed).shuffle(candidate_configs)
 
+        if self.candidate_ranker:
+            costs = [self.cost_estimator.estimate(x, self.dataset) for x in candidate_configs]
+            candidate_configs = self.candidate_ranker.rank(candidate_configs, costs, lambda x: [self.search_dim.featurize(x)], partial_history)
+
         for candidate_config in candidate_configs:
             if len(result) >= n_trials:
                 return result
@@ -92,11 +107,16 @@ class SingleVarSearchController(BaseAutomlController):
 
         return result
 
+    def worth_trying_candidates(self, history: List[TrainLog]):
+        """candidates not pruned, in the order of candidates"""
+        candidates_in_order = [x for x in self.search_dim.pruner.prune(self.base_config, self.search_dim.candidates_order, history)] if self.search_dim.pruner else self.search_dim.candidates
+        return [x for x in self.search_dim.candidates if x in candidates_in_order]
+
     def keep_history_varied_from_base_config(self, history: List[TrainLog]):
         if not history:
             return []
         var_accessor = self.search_dim.var_accessor
-        return [x for x in history if var_accessor.assign_val_to_config(x.config, var_accessor.parse_value(self.base_config)) == self.base_config]
+        return [x for x in history if var_accessor.equals_except_var(x.config, self.base_config)]
 
     def find_best_config(self, history: List[TrainLog]):
         history = self.keep_history_varied_from_base_config(history)
@@ -105,61 +125,203 @@ class SingleVarSearchController(BaseAutomlController):
         return super(SingleVarSearchController, self).find_best_config(history)
 
 
+class RefinementSearchController(SingleVarSearchController):
+    """
+    A controller that searches one numeric dimension/variable in config, which first tries the coarse candidates as SingleVarSearchController does, then zooms in around the peak:
+    new candidates are inserted in the middle of the brackets between the best tried value and its tried neighbours, until the brackets are narrower than resolution,
+    or max_refinements candidates have been inserted.
+
+    It assumes the metric values have a single peak over the dimension (see SinglePeakPruner), so that the peak always lies within the bracket around the best tried value.
+
+    Args:
+        resolution: the bracket width below which no more candidates are inserted, measured in log10 space if log_scale is True
+        log_scale: bisect brackets at the geometric mean instead of the arithmetic mean, e.g. for learning rates
+        integer: round the inserted candidates to integers, e.g. for epochs
+        max_refinements: the maximum number of candidates to insert, None for unlimited
+    """
+
+    def __init__(self, base_config, cost_estimator, dataset, candidates, var_accessor, resolution, pruner=None, random_seed=None, log_scale=False, integer=False, max_refinements=None,
+                 candidate_ranker: CandidateRanker = None):
+        if log_scale and any(x <= 0 for x in candidates):
+            raise ValueError('candidates have to be positive for log_scale.')
+
+        super(RefinementSearchController, self).__init__(base_config, cost_estimator, dataset, sorted(candidates), var_accessor, pruner, random_seed, candidate_ranker=candidate_ranker)
+        self.resolution = resolution
+        self.log_scale = log_scale
+        self.integer = integer
+        self.max_refinements = max_refinements
+
+    def generate_training_configs(self, budget_in_secs, history, n_trials):
+        result = super(RefinementSearchController, self).generate_training_configs(budget_in_secs, history, n_trials)
+        tried_vals = [self.search_dim.var_accessor.parse_value(x.config) for x in self.keep_history_varied_from_base_config(history)]
+        if result or any(x not in tried_vals for x in self.worth_trying_candidates(history)):
+            # don't zoom in, if the coarse candidates are not finished, e.g. the remaining ones don't fit in budget
+            return result
+
+        used_budget = 0
+        for candidate in self.refined_candidates(history):
+            if len(result) >= n_trials:
+                break
+
+            candidate_config = self.search_dim.var_accessor.assign_val_to_config(self.base_config, candidate)
+            cost = self.cost_estimator.estimate(candidate_config, self.dataset)
+            if cost > budget_in_secs - used_budget:
+                continue
+
+            used_budget += cost
+            result.append(candidate_config)
+
+        return result
+
+    def refined_candidates(self, history: List[TrainLog]):
+        """candidates to insert in the brackets around the best tried value, best side first"""
+        partial_history = self.keep_history_varied_from_base_config(history)
+        if not partial_history:
+            return []
+
+        var_accessor = self.search_dim.var_accessor
+        tried_vals = sorted({var_accessor.parse_value(x.config) for x in partial_history})
+        n_refined = len([x for x in tried_vals if x not in self.search_dim.candidates])
+        if self.max_refinements is not None and n_refined >= self.max_refinements:
+            return []
+
+        best_val = var_accessor.parse_value(max(partial_history).config)
+        best_idx = tried_vals.index(best_val)
+        neighbours = [tried_vals[i] for i in (best_idx - 1, best_idx + 1) if 0 <= i < len(tried_vals)]
+
+        # bisect the bracket of the better neighbour first, as the peak is more likely to be there
+        metric_vals = {var_accessor.parse_value(x.config): x.automl_metric_val for x in partial_history}
+        neighbours.sort(key=lambda x: metric_vals[x], reverse=True)
+
+        result = []
+        for neighbour in neighbours:
+            low, high = min(best_val, neighbour), max(best_val, neighbour)
+            if self._width(low, high) <= self.resolution:
+                continue
+
+            mid = self._middle(low, high)
+            if low < mid < high:
+                result.append(mid)
+
+        if self.max_refinements is not None:
+            result = result[:self.max_refinements - n_refined]
+
+        return result
+
+    def _width(self, low, high):
+        return math.log10(high) - math.log10(low) if self.log_scale else high - low
+
+    def _middle(self, low, high):
+        mid = math.sqrt(low * high) if self.log_scale else (low + high) / 2
+        return round(mid) if self.integer else mid
+
+
 class GridSearchController(BaseAutomlController):
     """
     A controller that searches across different dimensions/variables in config in a grid search manner, to find the best config in a heuristic manner, it stops generating, if
     - reaching the number of desired configs or no more configs worth trying
 
     grid search: https://en.wikipedia.org/wiki/Hyperparameter_optimization
+
+    if candidate_ranker is provided, all the configs in the grid are tried in the order given by it, instead of dimension by dimension
     """
 
-    def __init__(self, base_config, cost_estimator, dataset, grid_search_dims: List[SearchDimension], random_seed=None):
+    def __init__(self, base_config, cost_estimator, dataset, grid_search_dims: List[SearchDimension], random_seed=None, candidate_ranker: CandidateRanker = None):
         super(GridSearchController, self).__init__(cost_estimator, base_config)
         self.search_dims = grid_search_dims
         self.dataset = dataset
         self.random_seed = random_seed
+        self.candidate_ranker = candidate_ranker
+        self.var_accessor = MultiVarAccessor([d.var_accessor for d in grid_search_dims])
 
     @staticmethod
-    def create_from_single_var_controllers(base_config, cost_estimator, dataset, single_var_controllers: List[SingleVarSearchController], random_seed=None):
+    def create_from_single_var_controllers(base_config, cost_estimator, dataset, single_var_controllers: List[SingleVarSearchController], random_seed=None,
+                                           candidate_ranker: CandidateRanker = None):
         grid_search_dims = [c.search_dim for c in single_var_controllers]
-        return GridSearchController(base_config, cost_estimator, dataset, grid_search_dims, random_seed)
+        return GridSearchController(base_config, cost_estimator, dataset, grid_search_dims, random_seed, candidate_ranker)
 
     def generate_training_configs(self, budget_in_secs, history, n_trials):
+        if self.candidate_ranker:
+            return self.select_configs(self.ranked_candidate_configs(history), [], budget_in_secs, n_trials, history)
+
         return self.grid_search_configs(0, self.base_config, [], budget_in_secs, n_trials, history)
 
-    def grid_search_configs(self, c_idx, base_config, result, budget, n_trials, history):
+    def ranked_candidate_configs(self, history):
+        candidate_configs = self._grid_configs(0, self.base_config, [])
+        costs = [self.cost_estimator.estimate(x, self.dataset) for x in candidate_configs]
+        # only fit on the configs of this grid, i.e. varied from base config in the grid dimensions only, which copies history configs unless all the accessors are dict-based
+        partial_history = [x for x in history if self.var_accessor.equals_except_var(x.config, self.base_config)] if history else []
+        return self.candidate_ranker.rank(candidate_configs, costs, self._featurize, partial_history)
+
+    def _featurize(self, config):
+        features = [d.featurize(config) for d in self.search_dims]
+        return None if None in features else features
+
+    def grid_search_configs(self, c_idx, base_config, result, budget, n_trials, history, vals=None):
         if len(result) >= n_trials or c_idx == len(self.search_dims) or budget <= 0:
             return result
 
-        dim_searcher = self.search_dims[c_idx]
+        vals = vals or []
         if c_idx == len(self.search_dims) - 1:
-            used_budget = sum([self.cost_estimator.estimate(x, self.dataset) for x in result])
-            candidate_configs = [dim_searcher.var_accessor.assign_val_to_config(base_config, x) for x in dim_searcher.candidates]
-            history_configs = [x.config for x in history]
+            candidate_configs = self._leaf_configs(base_config, vals)
 
             if self.random_seed:
                 random.Random(self.random_seed).shuffle(candidate_configs)
 
-            for candidate_config in candidate_configs:
-                if len(result) >= n_trials:
-                    break
+            result = self.select_configs(candidate_configs, result, budget, n_trials, history)
+        else:
+            for candidate in self.search_dims[c_idx].candidates:
+                config, config_vals = self._descend(c_idx, base_config, vals, candidate)
+                result = self.grid_search_configs(c_idx + 1, config, result, budget, n_trials, history, config_vals)
 
-                if candidate_config in history_configs:
-                    continue
+        return result
 
-                cost = self.cost_estimator.estimate(candidate_config, self.dataset)
-                if cost > budget - used_budget:
-                    continue
+    def _descend(self, c_idx, base_config, vals, candidate):
+        """
+        base config and values for the dimensions after choosing candidate for dimension c_idx.
+        if all the accessors support in-place assignment, values are collected and only assigned when reaching a leaf, so that each leaf costs a single copy,
+        otherwise values are assigned level by level, so that each copy is shared by the subtree
+        """
+        if self.var_accessor.supports_in_place:
+            return base_config, vals + [candidate]
 
-                if not all([(not d.pruner) or d.pruner.is_valuable(candidate_config, d.var_accessor.parse_value(candidate_config), d.candidates, history) for d in self.search_dims]):
-                    continue
+        return self.search_dims[c_idx].var_accessor.assign_val_to_config(base_config, candidate), vals
 
-                used_budget += cost
-                result.append(candidate_config)
-        else:
-            for candidate in dim_searcher.candidates:
-                config = dim_searcher.var_accessor.assign_val_to_config(base_config, candidate)
-                result = self.grid_search_configs(c_idx + 1, config, result, budget, n_trials, history)
+    def _leaf_configs(self, base_config, vals):
+        dim_searcher = self.search_dims[-1]
+        if self.var_accessor.supports_in_place:
+            return [self.var_accessor.assign_val_to_config(base_config, vals + [x]) for x in dim_searcher.candidates]
+
+        return [dim_searcher.var_accessor.assign_val_to_config(base_config, x) for x in dim_searcher.candidates]
+
+    def _grid_configs(self, c_idx, base_config, vals):
+        """all the configs in the grid from dimension c_idx"""
+        if c_idx == len(self.search_dims) - 1:
+            return self._leaf_configs(base_config, vals)
+
+        return [x for candidate in self.search_dims[c_idx].candidates for x in self._grid_configs(c_idx + 1, *self._descend(c_idx, base_config, vals, candidate))]
+
+    def select_configs(self, candidate_configs, result, budget, n_trials, history):
+        """append the candidate configs not in history, within budget and worth trying according to the pruners, to result in order"""
+        used_budget = sum([self.cost_estimator.estimate(x, self.dataset) for x in result])
+        history_configs = [x.config for x in history]
+
+        for candidate_config in candidate_configs:
+            if len(result) >= n_trials:
+                break
+
+            if candidate_config in history_configs:
+                continue
+
+            cost = self.cost_estimator.estimate(candidate_config, self.dataset)
+            if cost > budget - used_budget:
+                continue
+
+            if not all([(not d.pruner) or d.pruner.is_valuable(candidate_config, d.var_accessor.parse_value(candidate_config), d.candidates, history) for d in self.search_dims]):
+                continue
+
+            used_budget += cost
+            result.append(candidate_config)
 
         return result
 
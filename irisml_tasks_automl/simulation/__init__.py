@@ -0,0 +1,3 @@
+from .replay_simulator import ReplayTable, ReplayCostEstimator, ReplaySimulator, SimulationResult
+
+__all__ = ['ReplayTable', 'ReplayCostEstimator', 'ReplaySimulator', 'SimulationResult']
@@ -0,0 +1,109 @@
+import heapq
+from typing import List
+
+from ..common.cost_estimator import CostEstimator
+from ..common.fingerprint import config_fingerprint
+from ..common.result_cache import TrialResultCache
+from ..common.train_log import TrainLog
+from ..controllers.search_controller import BaseAutomlController
+
+
+class ReplayTable(object):
+    """
+    A table of recorded train logs, which looks up the train log of a config by its fingerprint
+    """
+
+    def __init__(self, train_logs: List[TrainLog]):
+        self._train_logs = {config_fingerprint(x.config): x for x in train_logs}
+
+    def __call__(self, config):
+        fingerprint = config_fingerprint(config)
+        if fingerprint not in self._train_logs:
+            raise KeyError(f'config {fingerprint} is not recorded in the replay table.')
+
+        return self._train_logs[fingerprint]
+
+    def __len__(self):
+        return len(self._train_logs)
+
+
+class ReplayCostEstimator(CostEstimator):
+    """
+    Cost estimator returning the time cost recorded in a replay table (or given by a synthetic function config -> TrainLog)
+    """
+
+    def __init__(self, results):
+        super().__init__()
+        self.results = results
+
+    def estimate(self, train_config, dataset):
+        return self.results(train_config).time_cost
+
+
+class SimulationResult(object):
+    """
+    Result of a simulated search, where elapsed_secs is the virtual wall-clock time used, and best_train_log is the best successful trial (without err_msg)
+    """
+
+    def __init__(self, history: List[TrainLog], elapsed_secs, n_rounds):
+        self.history = history
+        self.elapsed_secs = elapsed_secs
+        self.n_rounds = n_rounds
+
+    @property
+    def best_train_log(self):
+        succeeded = [x for x in self.history if not x.err_msg]
+        return max(succeeded) if succeeded else None
+
+
+class ReplaySimulator(object):
+    """
+    Simulates a search with a controller without training, by replaying train logs (metric and time_cost) for the generated configs, and advancing a virtual clock.
+
+    In each round, the configs generated by the controller are dispatched to n_workers simulated workers in order, each config going to the earliest available worker,
+    and the round ends when all of them finish. Trials not finished by budget_in_secs are cut off, and not added to history.
+    The controller is given the remaining wall-clock time as budget, so that every trial it generates can finish in time, as each trial runs on a single worker.
+
+    Args:
+        results: list of recorded TrainLog, or a synthetic function config -> TrainLog
+        n_workers: number of simulated parallel workers
+        result_cache: optional TrialResultCache, configs found in it take no time, and finished trials are added to it
+    """
+
+    def __init__(self, results, n_workers=1, result_cache: TrialResultCache = None):
+        if n_workers < 1:
+            raise ValueError(f'n_workers should be positive, got {n_workers}.')
+
+        self.results = ReplayTable(results) if isinstance(results, list) else results
+        self.n_workers = n_workers
+        self.result_cache = result_cache
+
+    def run(self, controller: BaseAutomlController, budget_in_secs, n_trials, max_rounds=None):
+        clock = 0
+        history = []
+        n_rounds = 0
+        while (max_rounds is None or n_rounds < max_rounds) and clock < budget_in_secs:
+            configs = controller.generate_training_configs(budget_in_secs - clock, history, n_trials)
+            if not configs:
+                break
+
+            n_rounds += 1
+            workers = [clock] * self.n_workers
+            for config in configs:
+                train_log = self.result_cache.get(config) if self.result_cache else None
+                if train_log is not None:
+                    history.append(train_log)
+                    continue
+
+                train_log = self.results(config)
+                end = heapq.heappop(workers) + train_log.time_cost
+                heapq.heappush(workers, end)
+                if end <= budget_in_secs:
+                    train_log = TrainLog(config, train_log.metric, train_log.automl_metric_name, train_log.time_cost, train_log.err_msg)
+                    history.append(train_log)
+                    if self.result_cache:
+                        self.result_cache.put(train_log)
+
+            clock = min(max(workers), budget_in_secs)
+
+        return SimulationResult(history, clock, n_rounds)
@@ -0,0 +1,20 @@
+import pytest
+
+from irisml_tasks_automl import ExpectedImprovementPerSecondRanker, TrainLog
+
+
+def _featurize(config):
+    return [config / 10] if config <= 10 else None
+
+
+@pytest.mark.parametrize("history,costs,expected_order", [
+    ([], [3, 1, 2, 1], [4, 8, 6, 2]),
+    ([(2, 1), (4, 2)], [1, 1, 1, 1], [8, 6, 4, 2]),
+    ([(2, 2), (4, 1)], [1, 1, 1, 1], [8, 2, 6, 4]),
+    ([(2, 1), (4, 2)], [1, 1, 1000, 1], [8, 4, 2, 6]),
+    ([(2, 1), (4, 2), (20, 5)], [1, 1, 1, 1], [8, 6, 4, 2]),
+])
+def test_expected_improvement_per_second_ranker(history, costs, expected_order):
+    history = [TrainLog(x[0], {'automl_metric_val': x[1]}) for x in history]
+    ranker = ExpectedImprovementPerSecondRanker()
+    assert ranker.rank([2, 4, 6, 8], costs, _featurize, history) == expected_order
@@ -0,0 +1,60 @@
+from irisml_tasks_automl import CheckpointReuseScheduler, CostEstimator, DictConfigVarAccessor, SingleVarSearchController, TrainLog, config_fingerprint
+
+
+class EpochCostEstimator(CostEstimator):
+    def estimate(self, train_config, dataset):
+        return train_config['epochs'] * 10
+
+
+def _create_scheduler(resume_hook=None):
+    base_config = {'epochs': 1, 'lr': 0.1}
+    controller = SingleVarSearchController(base_config, EpochCostEstimator(), None, [8, 2, 4], DictConfigVarAccessor('epochs'))
+    return CheckpointReuseScheduler(controller, None, DictConfigVarAccessor('epochs'), resume_hook)
+
+
+def test_checkpoint_reuse_scheduler_charges_incremental_cost():
+    scheduler = _create_scheduler(lambda config, parent_config, lineage: {**config, 'resume_from': lineage.parent_fingerprint})
+    trials = scheduler.generate_scheduled_trials(100, [], 3)
+
+    assert [x.config['epochs'] for x in trials] == [2, 4, 8]
+    assert [x.cost for x in trials] == [20, 20, 40]
+    assert trials[0].lineage is None and trials[0].train_config == trials[0].config
+    assert trials[2].parent_config == {'epochs': 4, 'lr': 0.1}
+    assert trials[2].lineage.fidelity_delta == 4
+    assert trials[2].train_config == {'epochs': 8, 'lr': 0.1, 'resume_from': config_fingerprint({'lr': 0.1, 'epochs': 4})}
+    assert trials[0].depends_on is None and trials[1].depends_on is trials[0] and trials[2].depends_on is trials[1]
+
+
+def test_checkpoint_reuse_scheduler_charges_full_cost_for_plain_configs():
+    scheduler = _create_scheduler()
+    assert scheduler.generate_training_configs(140, [], 3) == [{'epochs': x, 'lr': 0.1} for x in [2, 4, 8]]
+    assert scheduler.generate_training_configs(80, [], 3) == [{'epochs': x, 'lr': 0.1} for x in [2, 4]]
+
+
+def test_checkpoint_reuse_scheduler_resumes_from_history():
+    scheduler = _create_scheduler()
+    history = [TrainLog({'epochs': 2, 'lr': 0.1}, {'acc': 1}), TrainLog({'epochs': 4, 'lr': 0.2}, {'acc': 1})]
+    trials = scheduler.generate_scheduled_trials(30, history, 3)
+
+    assert [x.config['epochs'] for x in trials] == [4]
+    assert trials[0].parent_config == {'epochs': 2, 'lr': 0.1}
+    assert trials[0].cost == 20
+    assert trials[0].depends_on is None
+
+
+def test_checkpoint_reuse_scheduler_skips_failed_parents():
+    scheduler = _create_scheduler()
+    history = [TrainLog({'epochs': 2, 'lr': 0.1}, {'acc': 0}, err_msg='OOM')]
+    trials = scheduler.generate_scheduled_trials(100, history, 3)
+
+    assert [(x.config['epochs'], x.cost) for x in trials] == [(4, 40), (8, 40)]
+
+
+def test_checkpoint_reuse_scheduler_backfills_when_first_generated_config_over_budget():
+    scheduler = _create_scheduler()
+    assert scheduler.controller.generate_training_configs(50, [], 1) == [{'epochs': 2, 'lr': 0.1}]
+    assert scheduler.generate_training_configs(50, [], 1) == [{'epochs': 2, 'lr': 0.1}]
+    assert [x.config['epochs'] for x in scheduler.generate_scheduled_trials(50, [], 1)] == [2]
+
+    trials = scheduler.generate_scheduled_trials(50, [], 2)
+    assert [(x.config['epochs'], x.cost) for x in trials] == [(2, 20), (4, 20)]
@@ -1,4 +1,5 @@
-from irisml_tasks_automl import DictConfigVarAccessor, DictBasedConfig
+from copy import deepcopy
+from irisml_tasks_automl import DictConfigVarAccessor, DictBasedConfig, MultiVarAccessor, ConfigVarAccessor, config_fingerprint
 import pytest
 
 
@@ -33,3 +34,88 @@ def test_dict_config_assign_value(path, val):
     accessor = DictConfigVarAccessor(path)
     config = accessor.assign_val_to_config(config, val)
     assert accessor.parse_value(config) == val
+
+
+def test_multi_var_accessor_assigns_with_single_copy():
+    config = DictBasedConfig(['optim/base_lr', 'optim/epochs', 'model'])
+    accessor = MultiVarAccessor([DictConfigVarAccessor('optim/base_lr'), DictConfigVarAccessor('optim/epochs'), DictConfigVarAccessor('model')])
+
+    result = accessor.assign_val_to_config(config, [0.1, 5, 'resnet'])
+    assert accessor.parse_value(result) == [0.1, 5, 'resnet']
+    assert config['optim'] == {'base_lr': {}, 'epochs': {}}
+
+    with pytest.raises(ValueError):
+        accessor.assign_val_to_config(config, [0.1, 5])
+
+
+@pytest.mark.parametrize("path,config,other,expected", [
+    ('optim/base_lr', {'optim': {'base_lr': 1, 'epochs': 3}}, {'optim': {'base_lr': 2, 'epochs': 3}}, True),
+    ('optim/base_lr', {'optim': {'base_lr': 1, 'epochs': 3}}, {'optim': {'base_lr': 2, 'epochs': 4}}, False),
+    ('optim/base_lr', {'optim': {'epochs': 3}}, {'optim': {'base_lr': 2, 'epochs': 3}}, True),
+    ('optim/base_lr', {'optim': {'base_lr': 1}, 'model': 'a'}, {'optim': {'base_lr': 2}, 'model': 'b'}, False),
+    ('optim/base_lr', {'optim': {'base_lr': 1}, 'model': 'a'}, {'optim': {'base_lr': 2}}, False),
+    ('optim', {'optim': 'wow'}, {'optim': {'base_lr': 2}}, True),
+])
+def test_dict_config_equals_except_var(path, config, other, expected):
+    accessor = DictConfigVarAccessor(path)
+    assert accessor.equals_except_var(config, other) == expected
+    assert ConfigVarAccessor.equals_except_var(accessor, config, other) == expected
+
+
+def test_multi_var_accessor_copies_once_per_accessor_not_in_place():
+    class CountingAccessor(ConfigVarAccessor):
+        n_copies = 0
+
+        def __init__(self, key):
+            self.key = key
+
+        def assign_val_to_config(self, config, val):
+            CountingAccessor.n_copies += 1
+            result = deepcopy(config)
+            result[self.key] = val
+            return result
+
+        def parse_value(self, config):
+            return config[self.key]
+
+    config = {'a': 0, 'b': 0, 'c': {}}
+    accessor = MultiVarAccessor([CountingAccessor('a'), CountingAccessor('b')])
+    assert not accessor.supports_in_place
+    assert accessor.assign_val_to_config(config, [1, 2]) == {'a': 1, 'b': 2, 'c': {}}
+    assert CountingAccessor.n_copies == 2
+
+    accessor = MultiVarAccessor([CountingAccessor('a'), DictConfigVarAccessor('c/d')])
+    result = accessor.assign_val_to_config(config, [1, 2])
+    assert result == {'a': 1, 'b': 0, 'c': {'d': 2}}
+    assert config == {'a': 0, 'b': 0, 'c': {}}
+    assert CountingAccessor.n_copies == 3
+    assert MultiVarAccessor([DictConfigVarAccessor('a'), DictConfigVarAccessor('c/d')]).supports_in_place
+
+
+@pytest.mark.parametrize("config,other", [
+    ({'lr': 3, 'epochs': 2}, {'epochs': 2, 'lr': 3.0}),
+    ({'flip': True, 'lr': [1, 2.0]}, {'flip': 1, 'lr': [1.0, 2]}),
+    ({1: 'a'}, {1.0: 'a'}),
+])
+def test_config_fingerprint_equal_configs(config, other):
+    assert config == other
+    assert config_fingerprint(config) == config_fingerprint(other)
+
+
+def test_config_fingerprint_different_configs():
+    assert config_fingerprint({'lr': 3}) != config_fingerprint({'lr': 3.5})
+    assert config_fingerprint({'lr': 3}) != config_fingerprint({'lr': '3'})
+
+
+@pytest.mark.parametrize("paths,config,other,expected", [
+    (['optim/base_lr', 'optim/epochs'], {'optim': {'base_lr': 1, 'epochs': 3, 'wd': 0}}, {'optim': {'base_lr': 2, 'epochs': 4, 'wd': 0}}, True),
+    (['optim/base_lr', 'optim/epochs'], {'optim': {'base_lr': 1, 'epochs': 3, 'wd': 0}}, {'optim': {'base_lr': 2, 'epochs': 4, 'wd': 1}}, False),
+    (['optim/base_lr', 'model'], {'optim': {'base_lr': 1}, 'model': 'a'}, {'optim': {'base_lr': 2}, 'model': 'b'}, True),
+    (['optim/base_lr', 'model'], {'optim': {'base_lr': 1}}, {'optim': {'base_lr': 2}, 'model': 'b'}, True),
+    (['optim/base_lr', 'model'], {'optim': {'base_lr': 1}, 'model': 'a', 'x': 1}, {'optim': {'base_lr': 2}, 'model': 'b'}, False),
+    (['optim', 'optim/base_lr'], {'optim': 'wow'}, {'optim': {'base_lr': 2}}, True),
+])
+def test_multi_var_accessor_equals_except_var(paths, config, other, expected):
+    accessor = MultiVarAccessor([DictConfigVarAccessor(x) for x in paths])
+    assert accessor.equals_except_var(config, other) == expected
+    assert ConfigVarAccessor.equals_except_var(accessor, config, other) == expected
@@ -0,0 +1,68 @@
+import pytest
+from unittest import mock
+
+from irisml_tasks_automl import ReplayCostEstimator, ReplaySimulator, ReplayTable, SinglePeakPruner, SingleVarSearchController, TrainLog, DictConfigVarAccessor
+
+RECORDED = [(1, 1, 10), (2, 3, 20), (3, 2, 30), (4, 1, 40)]
+
+
+def _create_controller(results, pruner=False):
+    return SingleVarSearchController({'epochs': 1}, ReplayCostEstimator(results), None, [1, 2, 3, 4], DictConfigVarAccessor('epochs'),
+                                     SinglePeakPruner(DictConfigVarAccessor('epochs')) if pruner else None)
+
+
+@pytest.mark.parametrize("n_workers,budget,n_trials,expected_epochs,expected_elapsed,expected_rounds", [
+    (1, 1000, 4, [1, 2, 3, 4], 100, 1),
+    (2, 1000, 4, [1, 2, 3, 4], 60, 1),
+    (4, 1000, 4, [1, 2, 3, 4], 40, 1),
+    (1, 1000, 1, [1, 2, 3, 4], 100, 4),
+    (1, 35, 1, [1, 2], 30, 2),
+    (2, 35, 2, [1, 2], 20, 1),
+    (4, 40, 4, [1, 2], 20, 1),
+])
+def test_replay_simulator(n_workers, budget, n_trials, expected_epochs, expected_elapsed, expected_rounds):
+    table = ReplayTable([TrainLog({'epochs': x[0]}, {'acc': x[1]}, time_cost=x[2]) for x in RECORDED])
+    result = ReplaySimulator(table, n_workers).run(_create_controller(table), budget, n_trials)
+
+    assert sorted(x.config['epochs'] for x in result.history) == expected_epochs
+    assert result.elapsed_secs == expected_elapsed
+    assert result.n_rounds == expected_rounds
+    assert result.best_train_log.config == {'epochs': 2}
+
+
+def test_replay_simulator_with_synthetic_results():
+    def results(config):
+        return TrainLog(config, {'acc': 10 - abs(config['epochs'] - 2)}, time_cost=config['epochs'])
+
+    result = ReplaySimulator(results).run(_create_controller(results, pruner=True), 1000, 1)
+    assert [x.config['epochs'] for x in result.history] == [1, 2, 3]
+    assert result.elapsed_secs == 6
+
+
+def test_replay_table_missing_config():
+    with pytest.raises(KeyError):
+        ReplayTable([TrainLog({'epochs': 1}, {'acc': 1})])({'epochs': 2})
+
+
+def test_replay_table_matches_equal_numbers():
+    assert ReplayTable([TrainLog({'lr': 3}, {'acc': 1})])({'lr': 3.0}).metric == {'acc': 1}
+
+
+def test_simulation_result_best_train_log_skips_failed_trials():
+    table = ReplayTable([TrainLog({'epochs': 1}, {'acc': 1}, time_cost=1), TrainLog({'epochs': 2}, {'acc': 5}, time_cost=1, err_msg='diverged')])
+    controller = SingleVarSearchController({'epochs': 1}, ReplayCostEstimator(table), None, [1, 2], DictConfigVarAccessor('epochs'))
+    result = ReplaySimulator(table).run(controller, 1000, 4)
+
+    assert len(result.history) == 2
+    assert result.best_train_log.config == {'epochs': 1}
+
+
+def test_replay_simulator_does_not_generate_trials_over_remaining_wall_clock():
+    table = ReplayTable([TrainLog({'epochs': x[0]}, {'acc': x[1]}, time_cost=x[2]) for x in RECORDED])
+    controller = _create_controller(table)
+    controller.generate_training_configs = mock.MagicMock(wraps=controller.generate_training_configs)
+    result = ReplaySimulator(table, n_workers=4).run(controller, 50, 1)
+
+    assert [x.config['epochs'] for x in result.history] == [1, 2]
+    assert [x[0][0] for x in controller.generate_training_configs.call_args_list] == [50, 40, 20]
+    assert result.elapsed_secs == 30
@@ -0,0 +1,79 @@
+import os
+import pickle
+
+from irisml_tasks_automl import TrialResultCache, TrainLog, ReplaySimulator, ReplayCostEstimator, SingleVarSearchController, DictConfigVarAccessor
+
+
+def test_result_cache_get_and_put(tmp_path):
+    cache = TrialResultCache(tmp_path, 'dataset_v1')
+    assert cache.get({'epochs': 1, 'lr': 0.1}) is None
+
+    cache.put(TrainLog({'epochs': 1, 'lr': 0.1}, {'acc': 0.5}, time_cost=10))
+    cache.put(TrainLog({'epochs': 2, 'lr': 0.1}, {'acc': 0.5}, err_msg='OOM'))
+    train_log = cache.get({'lr': 0.1, 'epochs': 1})
+    assert train_log.metric == {'acc': 0.5} and train_log.time_cost == 10
+    assert cache.get({'epochs': 2, 'lr': 0.1}) is None
+    assert len(cache) == 1
+
+    assert TrialResultCache(tmp_path, 'dataset_v2').get({'epochs': 1, 'lr': 0.1}) is None
+    new_cache = TrialResultCache(tmp_path, 'dataset_v1', version='new_code')
+    assert new_cache.get({'epochs': 1, 'lr': 0.1}) is None
+    new_cache.put(TrainLog({'epochs': 1, 'lr': 0.1}, {'acc': 0.7}))
+    assert new_cache.get({'epochs': 1, 'lr': 0.1}).metric == {'acc': 0.7}
+    assert cache.get({'epochs': 1, 'lr': 0.1}).metric == {'acc': 0.5}
+    assert len(cache) == 2
+
+
+def test_result_cache_ignores_broken_entries(tmp_path):
+    cache = TrialResultCache(tmp_path, 'dataset')
+    cache.put(TrainLog({'epochs': 1}, {'acc': 1}))
+    with open(cache._get_path({'epochs': 1}), 'wb') as f:
+        pickle.dump({'unexpected': 1}, f)
+    assert cache.get({'epochs': 1}) is None
+    assert len(cache) == 0
+
+    cache.put(TrainLog({'epochs': 1, 'func': lambda x: x}, {'acc': 1}))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = TrialResultCache(tmp_path, 'dataset', max_entries=2)
+    for i in range(2):
+        cache.put(TrainLog({'epochs': i}, {'acc': i}))
+        os.utime(cache._get_path({'epochs': i}), (i, i))
+
+    cache.get({'epochs': 0})
+    cache.put(TrainLog({'epochs': 2}, {'acc': 2}))
+    assert len(cache) == 2
+    assert cache.get({'epochs': 1}) is None
+    assert cache.get({'epochs': 0}) is not None
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_result_cache_wrap_trains_once(tmp_path):
+    calls = []
+
+    def train(config):
+        calls.append(config)
+        return TrainLog(config, {'acc': 1})
+
+    cached_train = TrialResultCache(tmp_path, 'dataset').wrap(train)
+    cached_train({'epochs': 1})
+    cached_train({'epochs': 1})
+    assert calls == [{'epochs': 1}]
+
+
+def test_replay_simulator_with_result_cache(tmp_path):
+    def results(config):
+        return TrainLog(config, {'acc': config['epochs']}, time_cost=10)
+
+    cache = TrialResultCache(tmp_path, 'dataset')
+    cache.put(TrainLog({'epochs': 1}, {'acc': 1}, time_cost=10))
+    controller = SingleVarSearchController({'epochs': 1}, ReplayCostEstimator(results), None, [1, 2, 3], DictConfigVarAccessor('epochs'))
+    result = ReplaySimulator(results, result_cache=cache).run(controller, 1000, 3)
+
+    assert result.elapsed_secs == 20
+    assert len(result.history) == 3
+    assert len(cache) == 3
@@ -1,8 +1,9 @@
+import math
 import pytest
 from copy import deepcopy
 from unittest import mock
 from irisml_tasks_automl import SinglePeakPruner, SingleVarSearchController, GridSearchController, SearchDimension, StageWiseSearchController,\
-    AlterDecorator, TrainLog, FlexibleBaseConfig, ConfigVarAccessor
+    AlterDecorator, RefinementSearchController, ExpectedImprovementPerSecondRanker, TrainLog, FlexibleBaseConfig, ConfigVarAccessor
 
 
 class FakeConfig(FlexibleBaseConfig):
@@ -277,3 +278,137 @@ def test_alter_decorator():
 
     best_config = c_a.find_best_config([TrainLog(FakeConfig(1, expected_var2), {'acc': 1})])
     assert best_config.var_2 == original_var2
+
+
+@pytest.mark.parametrize("history,n_trials,expected_configs", [
+    ([(1, 1), (2, 2), (4, 3), (8, 2), (16, 1)], 4, [3, 6]),
+    ([(1, 1), (2, 2), (4, 3), (8, 2), (16, 1), (6, 4), (3, 2)], 4, [5, 7]),
+    ([(1, 1), (2, 2), (4, 3), (8, 2), (16, 1), (6, 4), (3, 2), (5, 3), (7, 5)], 4, []),
+    ([(1, 5), (2, 2), (4, 1), (8, 1), (16, 1)], 4, []),
+    ([(1, 1), (2, 2), (4, 3)], 4, [8, 16]),
+])
+def test_refinement_search_controller(history, n_trials, expected_configs):
+    history = [TrainLog(FakeConfig(x[0], 1), {'automl_metric_val': x[1]}) for x in history]
+    expected_configs = [FakeConfig(x, 1) for x in expected_configs]
+    ce = mock.MagicMock()
+    ce.estimate.return_value = 0
+
+    controller = RefinementSearchController(FakeConfig(1, 1), ce, None, [16, 1, 2, 4, 8], Var1Accessor(), 1, SinglePeakPruner(Var1Accessor()), integer=True)
+    configs = controller.generate_training_configs(10000, history, n_trials)
+
+    assert configs == expected_configs
+
+
+def test_refinement_search_controller_converges_in_log_scale():
+    ce = mock.MagicMock()
+    ce.estimate.return_value = 0
+    peak = 0.0123
+
+    controller = RefinementSearchController(FakeConfig(1e-4, 1), ce, None, [1e-4, 1e-3, 1e-2, 1e-1, 1], Var1Accessor(), 0.01, SinglePeakPruner(Var1Accessor()), log_scale=True)
+    history = []
+    while True:
+        configs = controller.generate_training_configs(10000, history, 2)
+        if not configs:
+            break
+        history += [TrainLog(x, {'acc': -abs(math.log10(x.var_1 / peak))}) for x in configs]
+
+    assert abs(math.log10(controller.find_best_config(history).var_1 / peak)) < 0.01
+    assert len(history) < 25
+
+    controller.max_refinements = 2
+    history = history[:4]
+    while True:
+        configs = controller.generate_training_configs(10000, history, 2)
+        if not configs:
+            break
+        history += [TrainLog(x, {'acc': -abs(math.log10(x.var_1 / peak))}) for x in configs]
+
+    assert len(history) == 6
+
+
+@pytest.mark.parametrize("history,n_trials,expected_configs", [
+    ([], 2, [2, 4]),
+    ([(4, 3), (1, 1)], 2, [5, 2]),
+])
+def test_discrete_var_search_controller_with_candidate_ranker(history, n_trials, expected_configs):
+    history = [TrainLog(FakeConfig(x[0], 1), {'automl_metric_val': x[1]}) for x in history]
+    expected_configs = [FakeConfig(x, 1) for x in expected_configs]
+    ce = mock.MagicMock()
+    ce.estimate.side_effect = lambda config, dataset: 10 if config.var_1 in (1, 3) else 1
+
+    controller = SingleVarSearchController(FakeConfig(1, 1), ce, None, [1, 2, 3, 4, 5], Var1Accessor(), candidate_ranker=ExpectedImprovementPerSecondRanker())
+    configs = controller.generate_training_configs(10000, history, n_trials)
+
+    assert configs == expected_configs
+
+
+def test_grid_search_controller_with_candidate_ranker():
+    history = [TrainLog(FakeConfig(x[0], x[1]), {'automl_metric_val': x[2]}) for x in [(1, 1, 1), (4, 4, 3)]]
+    ce = mock.MagicMock()
+    ce.estimate.return_value = 1
+
+    gs = GridSearchController(FakeConfig(1, 1), ce, None, [SearchDimension([1, 2, 3, 4], Var1Accessor()), SearchDimension([1, 2, 3, 4], Var2Accessor())],
+                              candidate_ranker=ExpectedImprovementPerSecondRanker())
+    configs = gs.generate_training_configs(10000, history, 3)
+
+    assert len(configs) == 3
+    assert all(x.var_1 + x.var_2 >= 6 for x in configs)
+
+
+def test_refinement_search_controller_waits_for_coarse_candidates_over_budget():
+    history = [TrainLog(FakeConfig(x[0], 1), {'automl_metric_val': x[1]}) for x in [(1, 1), (2, 2), (4, 3), (8, 4)]]
+    ce = mock.MagicMock()
+    ce.estimate.side_effect = lambda config, dataset: config.var_1
+
+    controller = RefinementSearchController(FakeConfig(1, 1), ce, None, [1, 2, 4, 8, 16], Var1Accessor(), 1, SinglePeakPruner(Var1Accessor()), integer=True)
+    assert controller.generate_training_configs(10, history, 4) == []
+    assert controller.generate_training_configs(20, history, 4) == [FakeConfig(16, 1)]
+
+
+def test_grid_search_controller_ranks_on_history_of_the_grid_only():
+    history = [TrainLog(FakeConfig(x[0], x[1]), {'automl_metric_val': x[2]}) for x in [(1, 1, 1), (4, 4, 3)]]
+    other_history = [TrainLog(deepcopy(x.config), x.metric) for x in history]
+    for x in other_history:
+        x.config.other = 'from another stage'
+    ce = mock.MagicMock()
+    ce.estimate.return_value = 1
+    ranker = mock.MagicMock()
+    ranker.rank.side_effect = lambda configs, costs, featurize, history: configs
+
+    c1 = SingleVarSearchController(FakeConfig(1, 1), ce, None, [1, 2, 3, 4], Var1Accessor())
+    c2 = SingleVarSearchController(FakeConfig(1, 1), ce, None, [1, 2, 3, 4], Var2Accessor())
+    gs = GridSearchController.create_from_single_var_controllers(FakeConfig(1, 1), ce, None, [c1, c2], candidate_ranker=ranker)
+    gs.generate_training_configs(10000, history + other_history, 3)
+
+    assert ranker.rank.call_args[0][3] == history
+
+
+def test_refinement_search_controller_with_candidate_ranker():
+    ce = mock.MagicMock()
+    ce.estimate.side_effect = lambda config, dataset: 100 - config.var_1
+
+    controller = RefinementSearchController(FakeConfig(1, 1), ce, None, [16, 1, 4], Var1Accessor(), 1, candidate_ranker=ExpectedImprovementPerSecondRanker())
+    assert [x.var_1 for x in controller.generate_training_configs(10000, [], 3)] == [16, 4, 1]
+
+
+def test_grid_search_controller_shares_copies_for_accessors_not_in_place():
+    class CountingVar1Accessor(Var1Accessor):
+        n_copies = 0
+
+        def assign_val_to_config(self, config, val):
+            CountingVar1Accessor.n_copies += 1
+            return super().assign_val_to_config(config, val)
+
+    class CountingVar2Accessor(Var2Accessor):
+        def assign_val_to_config(self, config, val):
+            CountingVar1Accessor.n_copies += 1
+            return super().assign_val_to_config(config, val)
+
+    ce = mock.MagicMock()
+    ce.estimate.return_value = 0
+
+    gs = GridSearchController(FakeConfig(1, 1), ce, None, [SearchDimension([1, 2, 3, 4], CountingVar1Accessor()), SearchDimension([1, 2, 3, 4], CountingVar2Accessor())])
+    configs = gs.generate_training_configs(10000, [], 16)
+
+    assert len(configs) == 16
+    assert CountingVar1Accessor.n_copies == 4 + 16